@@ -1,5 +1,5 @@
 from langgraph.prebuilt import create_react_agent
-from langchain_openai import ChatOpenAI
+from simbora.services.llm_service import FAST_TIER, get_chat_model
 from simbora.tools.rag import (
     enriquecer_solicitacao_do_usuario,
     obter_caminhos_documentos
@@ -12,13 +12,7 @@ agent_prompt = (
     "Se mais de um curso for mencionado, responda com informações de ambos os cursos."
 )
 
-llm = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0,
-    max_tokens=None,
-    timeout=None,
-    max_retries=2,
-)
+llm = get_chat_model(FAST_TIER)
 
 rag_agent = create_react_agent(
     name="rag_agent",
@@ -1,17 +1,8 @@
-import os
 from langgraph.prebuilt import create_react_agent
-from langchain_openai import ChatOpenAI
-from simbora.tools.sigaa import SigaaAPI
-
-CLIENT_ID = os.getenv("SIGAA_API_CLIENT_ID")
-CLIENT_SECRET = os.getenv("SIGAA_API_CLIENT_SECRET") 
-X_API_KEY = os.getenv("SIGAA_API_X_API_KEY")
-
-sigaa_api = SigaaAPI(
-    client_id=CLIENT_ID,
-    client_secret=CLIENT_SECRET,
-    x_api_key=X_API_KEY,
-)
+from simbora.services.llm_service import FAST_TIER, get_chat_model
+from simbora.services.forum_index import FORUM_INDEX_COURSE_IDS
+from simbora.services.sigaa import sigaa_api
+from simbora.tools.foruns import buscar_mensagens_foruns
 
 agent_prompt = (
     "Você é um especialista em informações acadêmicas e administrativas do SIGAA."
@@ -20,27 +11,32 @@ agent_prompt = (
     "Se mais de um curso for mencionado, responda com informações de ambos os cursos."
 )
 
-llm = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0,
-    max_tokens=None,
-    timeout=None,
-    max_retries=2,
-)
+llm = get_chat_model(FAST_TIER)
+
+tools = [
+    sigaa_api.get_avaliacoes_docentes,
+    sigaa_api.get_calendarios_academicos,
+    sigaa_api.get_componentes_curriculares,
+    sigaa_api.get_cursos,
+    sigaa_api.get_foruns_curso,
+    sigaa_api.get_mensagens_forum,
+    sigaa_api.get_noticias,
+    sigaa_api.get_unidades
+]
+
+# get_mensagens_forum stays as the fallback for courses that are not indexed
+if FORUM_INDEX_COURSE_IDS:
+    tools.append(buscar_mensagens_foruns)
+    agent_prompt += (
+        "Para buscar mensagens de fóruns, prefira buscar_mensagens_foruns, que só cobre os cursos com os IDs "
+        f"{', '.join(str(id_curso) for id_curso in FORUM_INDEX_COURSE_IDS)}. "
+        "Para os demais cursos, utilize get_foruns_curso e get_mensagens_forum."
+    )
 
 sigaa_agent = create_react_agent(
     name="sigaa_agent",
     model=llm,
-    tools=[
-        sigaa_api.get_avaliacoes_docentes,
-        sigaa_api.get_calendarios_academicos,
-        sigaa_api.get_componentes_curriculares,
-        sigaa_api.get_cursos,
-        sigaa_api.get_foruns_curso,
-        sigaa_api.get_mensagens_forum,
-        sigaa_api.get_noticias,
-        sigaa_api.get_unidades
-    ],
+    tools=tools,
     prompt=agent_prompt
 )
 
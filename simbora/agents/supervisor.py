@@ -1,17 +1,69 @@
+import os
+import uuid
+from langchain_core.messages import HumanMessage, RemoveMessage, SystemMessage, get_buffer_string
+from langgraph.graph import END, START, MessagesState, StateGraph
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
 from langgraph_supervisor import create_supervisor
 from simbora.agents.rag import rag_agent
 from simbora.agents.sigaa import sigaa_agent
-from langchain_openai import ChatOpenAI
+from simbora.services.llm_service import FAST_TIER, get_chat_model, get_tiered_chat_model
+from simbora.services.session import session_service
 
-llm = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0,
-    max_tokens=None,
-    timeout=None,
-    max_retries=2,
-)
+SESSION_MAX_TURNS = int(os.getenv("SESSION_MAX_TURNS", 4))
+SESSION_SUMMARY_MAX_WORDS = int(os.getenv("SESSION_SUMMARY_MAX_WORDS", 200))
+SUMMARY_MESSAGE_ID = "conversation_summary"
 
-supervisor = create_supervisor(
+llm = get_tiered_chat_model()
+summary_llm = get_chat_model(FAST_TIER)
+
+
+class SessionState(MessagesState):
+    summary: str
+
+
+def compact_history(state: SessionState):
+    """
+    once the session exceeds twice SESSION_MAX_TURNS user turns, folds the older ones into a
+    rolling summary and keeps only the last SESSION_MAX_TURNS verbatim, so the prompt size stays
+    bounded across long conversations while summarizing only every SESSION_MAX_TURNS turns
+    """
+    messages = state["messages"]
+    turns = [i for i, message in enumerate(messages) if isinstance(message, HumanMessage)]
+    if len(turns) <= 2 * SESSION_MAX_TURNS:
+        return {}
+
+    # cutting at a user message never separates a tool call from its result
+    cut = turns[-SESSION_MAX_TURNS]
+    old_messages = [message for message in messages[:cut] if message.id != SUMMARY_MESSAGE_ID]
+
+    try:
+        summary = summary_llm.invoke([
+            SystemMessage(
+                "Atualize o resumo da conversa entre o usuário e o assistente com as novas mensagens. "
+                "Mantenha os cursos, disciplinas, datas e decisões mencionados. "
+                f"Responda apenas com o resumo, com no máximo {SESSION_SUMMARY_MAX_WORDS} palavras."
+            ),
+            HumanMessage(
+                f"Resumo atual:\n{state.get('summary', '')}\n\n"
+                f"Novas mensagens:\n{get_buffer_string(old_messages)}"
+            ),
+        ]).content
+    except Exception as e:
+        # compaction is only an optimization, it is retried on the next turn
+        print(f"Failed to summarize the conversation: {e}")
+        return {}
+
+    return {
+        "summary": summary,
+        "messages": [
+            RemoveMessage(id=REMOVE_ALL_MESSAGES),
+            SystemMessage(f"Resumo da conversa até aqui: {summary}", id=SUMMARY_MESSAGE_ID),
+            *messages[cut:],
+        ],
+    }
+
+
+supervisor_agent = create_supervisor(
     supervisor_name="simbora_supervisor",
     model=llm,
     agents=[rag_agent, sigaa_agent],
@@ -24,12 +76,23 @@ supervisor = create_supervisor(
     )
 ).compile()
 
+workflow = StateGraph(SessionState)
+workflow.add_node("compact_history", compact_history)
+workflow.add_node("simbora_supervisor", supervisor_agent)
+workflow.add_edge(START, "compact_history")
+workflow.add_edge("compact_history", "simbora_supervisor")
+workflow.add_edge("simbora_supervisor", END)
+
+supervisor = workflow.compile(checkpointer=session_service.checkpointer)
+
 
 if __name__ == "__main__":
-    user_input = input("Digite sua pergunta: ")
-    response = supervisor.invoke(
-        {"messages": [{"role": "user", "content": user_input}]}
-    )
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+    while True:
+        user_input = input("Digite sua pergunta: ")
+        response = supervisor.invoke(
+            {"messages": [{"role": "user", "content": user_input}]},
+            config=config
+        )
 
-    for message in response["messages"]:
-        print(f"{message.content}")
\ No newline at end of file
+        print(f"{response['messages'][-1].content}")
\ No newline at end of file
@@ -1,10 +1,14 @@
 import os
+import uuid
+from contextlib import asynccontextmanager
 from typing import Annotated, Optional
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, Query, Response
 from fastapi.responses import RedirectResponse
 from langchain_openai import OpenAIEmbeddings
 from pydantic import BaseModel
 from simbora.agents.supervisor import supervisor
+from simbora.services.forum_index import FORUM_INDEX_COURSE_IDS, FORUM_INDEX_INTERVAL_SECONDS, get_forum_index
+from simbora.services.session import SESSION_EVICTION_INTERVAL_SECONDS, session_service
 
 ENDPOINT_QUERY_AI_MAX_SIZE = int(os.getenv("ENDPOINT_QUERY_AI_MAX_SIZE"))
 ENDPOINT_EMBEDDING_TEXT_MAX_SIZE = int(os.getenv("ENDPOINT_EMBEDDING_TEXT_MAX_SIZE"))
@@ -13,17 +17,38 @@ ENDPOINT_EMBEDDING_MODEL = os.getenv("ENDPOINT_EMBEDDING_MODEL")
 class StructuredQuery(BaseModel):
     course: Optional[str] = None
     content: Annotated[str, Query(max_length=ENDPOINT_QUERY_AI_MAX_SIZE)]
+    thread_id: Annotated[Optional[str], Query(max_length=64)] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if FORUM_INDEX_COURSE_IDS:
+        get_forum_index().start(FORUM_INDEX_INTERVAL_SECONDS)
+    session_service.start(SESSION_EVICTION_INTERVAL_SECONDS)
+    yield
+    if FORUM_INDEX_COURSE_IDS:
+        get_forum_index().stop()
+    session_service.stop()
 
 
 app = FastAPI(
     title="Simbora API",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 @app.get("/ai")
-async def ai(structured_query: StructuredQuery):
-    response = supervisor.invoke({"messages": [{"role": "user", "content": structured_query.content}]})
-    return response["messages"][-1].content
+async def ai(structured_query: StructuredQuery, response: Response):
+    # a new session is opened when the client does not send one, its id is returned in the X-Thread-Id header
+    thread_id = structured_query.thread_id or str(uuid.uuid4())
+    session_service.touch(thread_id)
+    result = supervisor.invoke(
+        {"messages": [{"role": "user", "content": structured_query.content}]},
+        config={"configurable": {"thread_id": thread_id}}
+    )
+    session_service.prune(thread_id)
+    response.headers["X-Thread-Id"] = thread_id
+    return result["messages"][-1].content
 
 # FIXME: CORs policy should be set to allow requests from the matriculaai-backend only
 @app.post("/embedding")
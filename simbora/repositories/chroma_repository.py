@@ -5,7 +5,7 @@ from langchain_chroma import Chroma
 from langchain_core.documents import Document
 from langchain_core.vectorstores import VectorStoreRetriever
 from langchain_openai import OpenAIEmbeddings
-from typing import Iterable
+from typing import Iterable, Optional
 
 class ChromaRepository:
     def __init__(
@@ -27,14 +27,16 @@ class ChromaRepository:
             raise RuntimeError(f"Failed to initialize Chroma repository: {e}")
 
 
-    def add_docs(self, docs: list[Document]):
+    def add_docs(self, docs: list[Document], ids: Optional[list[str]] = None):
         """
         add a list of langchain documents into the chromadb
         :param docs: list of langchain documents
+        :param ids: optional list of document ids, documents with existing ids are overwritten
         """
         if docs:
             for i in range(0, len(docs), 100):
-                self._db.add_documents(docs[i:i+100])
+                batch_ids = ids[i:i+100] if ids else None
+                self._db.add_documents(docs[i:i+100], ids=batch_ids)
 
 
     def remove_docs(self, sources: Iterable[str]):
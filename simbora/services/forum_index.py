@@ -0,0 +1,44 @@
+import os
+import threading
+from typing import Optional
+from simbora.services.forum_index_service import ForumIndexService
+from simbora.repositories.chroma_repository import ChromaRepository
+from simbora.services.sigaa import sigaa_api
+
+FORUM_INDEX_COURSE_IDS = [
+    int(id_curso) for id_curso in os.getenv("FORUM_INDEX_COURSE_IDS", "").split(",") if id_curso.strip()
+]
+FORUM_INDEX_INTERVAL_SECONDS = float(os.getenv("FORUM_INDEX_INTERVAL_SECONDS", 15 * 60))
+
+_forum_index: Optional[ForumIndexService] = None
+_forum_index_lock = threading.Lock()
+
+def get_forum_index() -> ForumIndexService:
+    """
+    lazily builds the forum index, so nothing is connected when the feature is not configured
+    :return: forum index of the courses in FORUM_INDEX_COURSE_IDS
+    """
+    global _forum_index
+    if not FORUM_INDEX_COURSE_IDS:
+        raise RuntimeError("Forum index is disabled, set FORUM_INDEX_COURSE_IDS to enable it")
+
+    with _forum_index_lock:
+        if _forum_index is None:
+            chroma_repo = ChromaRepository(
+                host=os.getenv("CHROMA_HOST", "localhost"),
+                port=int(os.getenv("CHROMA_PORT", 8000)),
+                embedding_model=os.getenv("EMBEDDING_MODEL", "text-embedding-3-large"),
+                collection_name=os.getenv("CHROMA_FORUM_COLLECTION_NAME", "simbora_foruns")
+            )
+
+            _forum_index = ForumIndexService(
+                chroma_repository=chroma_repo,
+                sigaa_api=sigaa_api,
+                course_ids=FORUM_INDEX_COURSE_IDS,
+                state_path=os.getenv("FORUM_INDEX_STATE_PATH", "./forum_index_state.json"),
+            )
+
+    return _forum_index
+
+if __name__ == "__main__":
+    print(f"Indexed {get_forum_index().sync()} new forum messages.")
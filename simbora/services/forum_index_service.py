@@ -0,0 +1,260 @@
+import os
+import re
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional
+from langchain_core.documents import Document
+from simbora.repositories.chroma_repository import ChromaRepository
+from simbora.tools.sigaa import SigaaAPI
+
+FORUM_ID_FIELDS = ("id-forum", "id-forum-curso", "id")
+MESSAGE_ID_FIELDS = ("id-mensagem-forum", "id-mensagem", "id")
+MESSAGE_DATE_FIELDS = ("data-cadastro", "data", "data-criacao")
+MESSAGE_CONTENT_FIELDS = ("conteudo", "mensagem", "texto")
+MESSAGE_TITLE_FIELDS = ("titulo", "assunto")
+MESSAGE_MAX_CHARS = 4000
+
+# FIXME: the fields of the SIGAA forum endpoints are not documented, so the first present key wins
+def _first(data: dict, keys: Iterable[str]) -> Any:
+    for key in keys:
+        if data.get(key) is not None:
+            return data[key]
+    return None
+
+
+def _message_id(message: dict) -> Optional[int]:
+    """
+    :param message: message as returned by the SIGAA API
+    :return: message id as an int, since it may come as a string, or None if missing or invalid
+    """
+    try:
+        return int(_first(message, MESSAGE_ID_FIELDS))
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_timestamp(value: Any) -> int:
+    """
+    converts a SIGAA date (epoch in milliseconds or ISO string) into an epoch in seconds
+    :param value: date as returned by the SIGAA API
+    :return: epoch in seconds, or 0 if the date is missing or unknown
+    """
+    if isinstance(value, (int, float)):
+        return int(value / 1000) if value > 10**11 else int(value)
+    if isinstance(value, str):
+        try:
+            date = datetime.fromisoformat(value)
+        except ValueError:
+            return 0
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        return int(date.timestamp())
+    return 0
+
+
+def _parse_date(value: str) -> int:
+    """
+    :param value: ISO date (YYYY-MM-DD) given to the search
+    :return: epoch in seconds at the start of the date (UTC)
+    :raises ValueError: if the date is not a valid ISO date
+    """
+    try:
+        date = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Data inválida: '{value}'. Utilize o formato AAAA-MM-DD.")
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return int(date.timestamp())
+
+
+class ForumIndexService:
+    def __init__(
+        self,
+        chroma_repository: ChromaRepository,
+        sigaa_api: SigaaAPI,
+        course_ids: Iterable[int],
+        state_path: str,
+        page_size: int = 100,
+    ):
+        self._chroma_repository = chroma_repository
+        self._sigaa_api = sigaa_api
+        self._course_ids = list(course_ids)
+        self._state_path = state_path
+        self._page_size = page_size
+        self._sync_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._high_water_marks: dict[str, int] = self._load_state()
+
+    def _load_state(self) -> dict[str, int]:
+        """
+        :return: per-forum high-water marks (greatest indexed message id) stored in the state file
+        """
+        if not os.path.exists(self._state_path):
+            return {}
+        with open(self._state_path, "r", encoding="utf-8") as file:
+            return json.load(file)
+
+
+    def _save_state(self):
+        """
+        atomically persists the per-forum high-water marks into the state file
+        """
+        tmp_path = f"{self._state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self._high_water_marks, file)
+        os.replace(tmp_path, self._state_path)
+
+
+    def _fetch_new_messages(self, id_forum: int, high_water_mark: int) -> list[dict]:
+        """
+        pages through the forum messages, newest first, until reaching already indexed ones
+        :param id_forum: forum id
+        :param high_water_mark: greatest message id already indexed for the forum
+        :return: list of messages newer than the high-water mark
+        """
+        new_messages = []
+        offset = 0
+        while True:
+            page = self._sigaa_api.get_mensagens_forum_pagina(id_forum, offset=offset, limit=self._page_size)
+            fresh = [message for message in page if (_message_id(message) or 0) > high_water_mark]
+            new_messages.extend(fresh)
+
+            if len(page) < self._page_size or len(fresh) < len(page):
+                return new_messages
+            offset += self._page_size
+
+
+    @staticmethod
+    def _to_document(id_curso: int, id_forum: int, forum_title: str, message: dict) -> Document:
+        content = re.sub(r"<[^>]+>", " ", str(_first(message, MESSAGE_CONTENT_FIELDS) or ""))
+        content = re.sub(r"\s+", " ", content).strip()
+        title = _first(message, MESSAGE_TITLE_FIELDS) or forum_title
+        timestamp = _to_timestamp(_first(message, MESSAGE_DATE_FIELDS))
+
+        return Document(
+            page_content=f"{title}\n{content}"[:MESSAGE_MAX_CHARS],
+            metadata={
+                "source": f"sigaa-forum:{id_forum}",
+                "id_curso": int(id_curso),
+                "id_forum": int(id_forum),
+                "id_mensagem": _message_id(message),
+                "titulo": str(title),
+                "timestamp": timestamp,
+                "data": datetime.fromtimestamp(timestamp, timezone.utc).date().isoformat() if timestamp else "",
+            }
+        )
+
+
+    def _sync_forum(self, id_curso: int, forum: dict) -> int:
+        """
+        fetches and embeds only the messages newer than the forum high-water mark
+        :return: number of indexed messages
+        """
+        id_forum = _first(forum, FORUM_ID_FIELDS)
+        if id_forum is None:
+            return 0
+
+        high_water_mark = int(self._high_water_marks.get(str(id_forum), 0))
+        messages = [
+            message for message in self._fetch_new_messages(id_forum, high_water_mark)
+            if _message_id(message) is not None
+        ]
+        if not messages:
+            return 0
+
+        forum_title = str(_first(forum, MESSAGE_TITLE_FIELDS) or "")
+        docs = [self._to_document(id_curso, id_forum, forum_title, message) for message in messages]
+        # ids are deterministic so re-indexing after a lost state file overwrites instead of duplicating
+        ids = [f"{id_forum}-{doc.metadata['id_mensagem']}" for doc in docs]
+        self._chroma_repository.add_docs(docs, ids=ids)
+
+        self._high_water_marks[str(id_forum)] = max(doc.metadata["id_mensagem"] for doc in docs)
+        self._save_state()
+        return len(docs)
+
+
+    def sync(self) -> int:
+        """
+        incrementally syncs the messages of all forums of the configured courses into the collection
+        :return: number of indexed messages
+        """
+        indexed = 0
+        with self._sync_lock:
+            for id_curso in self._course_ids:
+                try:
+                    foruns = self._sigaa_api.get_foruns_curso(id_curso)
+                except Exception as e:
+                    print(f"Failed to fetch forums of course {id_curso}: {e}")
+                    continue
+
+                for forum in foruns:
+                    try:
+                        indexed += self._sync_forum(id_curso, forum)
+                    except Exception as e:
+                        print(f"Failed to sync forum {_first(forum, FORUM_ID_FIELDS)} of course {id_curso}: {e}")
+        return indexed
+
+
+    def _run(self, interval: float):
+        while not self._stop_event.is_set():
+            try:
+                self.sync()
+            except Exception as e:
+                print(f"Forum index sync failed: {e}")
+            self._stop_event.wait(interval)
+
+
+    def start(self, interval: float):
+        """
+        starts the background indexer, syncing every interval seconds
+        :param interval: seconds between syncs
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="forum-indexer", daemon=True)
+        self._thread.start()
+
+
+    def stop(self):
+        """
+        stops the background indexer
+        """
+        self._stop_event.set()
+
+
+    def search(
+        self,
+        query: str,
+        id_curso: Optional[int] = None,
+        data_inicio: Optional[str] = None,
+        data_fim: Optional[str] = None,
+        k: int = 5,
+    ) -> list[Document]:
+        """
+        semantic search over the indexed forum messages
+        :param query: search text
+        :param id_curso: optional course id filter
+        :param data_inicio: optional ISO date (YYYY-MM-DD), only messages from this date on
+        :param data_fim: optional ISO date (YYYY-MM-DD), only messages up to this date
+        :param k: number of messages to return
+        :return: list of the most relevant messages
+        :raises ValueError: if a date filter is not a valid ISO date
+        """
+        conditions = []
+        if id_curso is not None:
+            conditions.append({"id_curso": int(id_curso)})
+        if data_inicio:
+            conditions.append({"timestamp": {"$gte": _parse_date(data_inicio)}})
+        if data_fim:
+            conditions.append({"timestamp": {"$lt": _parse_date(data_fim) + 24 * 60 * 60}})
+
+        search_kwargs: dict[str, Any] = {"k": k}
+        if len(conditions) == 1:
+            search_kwargs["filter"] = conditions[0]
+        elif conditions:
+            search_kwargs["filter"] = {"$and": conditions}
+
+        return self._chroma_repository.as_retriever(search_kwargs=search_kwargs).invoke(query)
@@ -0,0 +1,287 @@
+import os
+import time
+import threading
+from collections import deque
+from contextvars import copy_context
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import Field
+
+FAST_TIER = "fast"
+STRONG_TIER = "strong"
+
+TIER_PROVIDERS = {
+    FAST_TIER: os.getenv("LLM_FAST_TIER_PROVIDERS", "groq:llama-3.1-8b-instant,openai:gpt-4o-mini"),
+    STRONG_TIER: os.getenv("LLM_STRONG_TIER_PROVIDERS", "openai:gpt-4o-mini,groq:llama-3.3-70b-versatile"),
+}
+
+HEDGE_QUANTILE = float(os.getenv("LLM_HEDGE_QUANTILE", 0.95))
+HEDGE_DEFAULT_DELAY = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", 3.0))
+HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", 20))
+
+
+class LatencyTracker:
+    def __init__(self, window_size: int = 200):
+        self._window_size = window_size
+        self._latencies: dict[str, deque[float]] = {}
+        self._errors: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, seconds: float):
+        """
+        records the latency of a successful call
+        :param provider: provider identifier, e.g. 'groq:llama-3.1-8b-instant'
+        :param seconds: wall time of the call
+        """
+        with self._lock:
+            self._latencies.setdefault(provider, deque(maxlen=self._window_size)).append(seconds)
+
+
+    def record_error(self, provider: str):
+        """
+        records a failed call
+        :param provider: provider identifier
+        """
+        with self._lock:
+            self._errors[provider] = self._errors.get(provider, 0) + 1
+
+
+    def percentile(self, provider: str, quantile: float, min_samples: int = 1) -> Optional[float]:
+        """
+        :param provider: provider identifier
+        :param quantile: value between 0 and 1, e.g. 0.95 for the p95
+        :param min_samples: minimum number of samples required to trust the estimate
+        :return: latency at the given quantile, or None if there are not enough samples
+        """
+        with self._lock:
+            samples = sorted(self._latencies.get(provider, ()))
+
+        if len(samples) < max(min_samples, 1):
+            return None
+
+        index = min(int(quantile * len(samples)), len(samples) - 1)
+        return samples[index]
+
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """
+        :return: per-provider summary with sample count, p50, p95 and error count
+        """
+        with self._lock:
+            providers = set(self._latencies) | set(self._errors)
+            errors = dict(self._errors)
+
+        return {
+            provider: {
+                "samples": len(self._latencies.get(provider, ())),
+                "p50": self.percentile(provider, 0.5),
+                "p95": self.percentile(provider, 0.95),
+                "errors": errors.get(provider, 0),
+            }
+            for provider in providers
+        }
+
+
+latency_tracker = LatencyTracker()
+
+
+class HedgedChatModel(BaseChatModel):
+    """
+    Chat model that calls a list of providers in priority order.
+    If the provider in flight is slower than its observed latency quantile, the next provider
+    is fired as a hedge and the first answer wins. Provider errors fail over to the next one.
+    """
+    models: list[Any]
+    provider_names: list[str]
+    tracker: LatencyTracker = Field(default=latency_tracker)
+    hedge_quantile: float = HEDGE_QUANTILE
+    hedge_default_delay: float = HEDGE_DEFAULT_DELAY
+    hedge_min_samples: int = HEDGE_MIN_SAMPLES
+
+    @property
+    def _llm_type(self) -> str:
+        return "hedged"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"providers": self.provider_names, "hedge_quantile": self.hedge_quantile}
+
+    def bind_tools(self, tools, parallel_tool_calls: Optional[bool] = None, **kwargs) -> "HedgedChatModel":
+        """
+        binds the tools to every provider, sharing the same latency tracker
+        """
+        if parallel_tool_calls is not None:
+            kwargs["parallel_tool_calls"] = parallel_tool_calls
+        return self.model_copy(update={"models": [model.bind_tools(tools, **kwargs) for model in self.models]})
+
+
+    def _hedge_delay(self, provider: str) -> float:
+        """
+        :return: seconds to wait on the provider before firing a hedge request
+        """
+        threshold = self.tracker.percentile(provider, self.hedge_quantile, self.hedge_min_samples)
+        return self.hedge_default_delay if threshold is None else threshold
+
+
+    def _call(
+        self,
+        provider: str,
+        model,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]],
+        config: Optional[dict],
+        **kwargs
+    ) -> BaseMessage:
+        start = time.perf_counter()
+        try:
+            message = model.invoke(messages, config=config, stop=stop, **kwargs)
+        except Exception:
+            self.tracker.record_error(provider)
+            raise
+        self.tracker.record(provider, time.perf_counter() - start)
+        return message
+
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        candidates = iter(zip(self.provider_names, self.models))
+        pending: dict[Future, str] = {}
+        errors: list[str] = []
+        executor = ThreadPoolExecutor(max_workers=len(self.models))
+        # keeps the provider calls under this run so callbacks, tags and tracing are not lost
+        config = {"callbacks": run_manager.get_child()} if run_manager else None
+
+        def launch_next() -> bool:
+            candidate = next(candidates, None)
+            if candidate is None:
+                return False
+            provider, model = candidate
+            future = executor.submit(copy_context().run, self._call, provider, model, messages, stop, config, **kwargs)
+            pending[future] = provider
+            return True
+
+        try:
+            has_more = launch_next()
+            while pending:
+                newest = list(pending.values())[-1]
+                timeout = self._hedge_delay(newest) if has_more else None
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                if not done:
+                    has_more = launch_next()
+                    continue
+
+                for future in done:
+                    provider = pending.pop(future)
+                    try:
+                        message = future.result()
+                    except Exception as e:
+                        errors.append(f"{provider}: {e}")
+                        if not pending:
+                            has_more = launch_next()
+                        continue
+                    return ChatResult(generations=[ChatGeneration(message=message)])
+        finally:
+            # losing requests are left to finish in the background so their latency is still recorded
+            executor.shutdown(wait=False)
+
+        raise RuntimeError(f"All LLM providers failed: {'; '.join(errors)}")
+
+
+class TieredChatModel(BaseChatModel):
+    """
+    Chat model that routes with the fast tier and synthesizes with the strong tier.
+    The strong tier is used once tool (or agent) results arrived after the last user message,
+    i.e. when the model is expected to compose the final answer.
+    """
+    fast: Any
+    strong: Any
+
+    @property
+    def _llm_type(self) -> str:
+        return "tiered"
+
+    def bind_tools(self, tools, parallel_tool_calls: Optional[bool] = None, **kwargs) -> "TieredChatModel":
+        return self.model_copy(update={
+            "fast": self.fast.bind_tools(tools, parallel_tool_calls=parallel_tool_calls, **kwargs),
+            "strong": self.strong.bind_tools(tools, parallel_tool_calls=parallel_tool_calls, **kwargs),
+        })
+
+
+    @staticmethod
+    def _is_synthesis(messages: list[BaseMessage]) -> bool:
+        for message in reversed(messages):
+            if isinstance(message, ToolMessage):
+                return True
+            if isinstance(message, HumanMessage):
+                return False
+        return False
+
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        model = self.strong if self._is_synthesis(messages) else self.fast
+        config = {"callbacks": run_manager.get_child()} if run_manager else None
+        message = model.invoke(messages, config=config, stop=stop, **kwargs)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def _build_provider(provider: str, model_name: str) -> BaseChatModel:
+    if provider == "openai":
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(model=model_name, temperature=0, max_tokens=None, timeout=None, max_retries=1)
+    if provider == "groq":
+        from langchain_groq import ChatGroq
+        return ChatGroq(model=model_name, temperature=0, max_tokens=None, timeout=None, max_retries=1)
+    raise ValueError(f"Unknown LLM provider: {provider}")
+
+
+def get_chat_model(tier: str) -> HedgedChatModel:
+    """
+    builds the hedged chat model of a tier from its providers list, e.g.
+    'groq:llama-3.1-8b-instant,openai:gpt-4o-mini'. Providers that cannot be
+    initialized (e.g. missing API key) are skipped.
+    :param tier: FAST_TIER or STRONG_TIER
+    :return: hedged chat model with the tier providers in priority order
+    """
+    names, models = [], []
+    for entry in TIER_PROVIDERS[tier].split(","):
+        provider, _, model_name = entry.strip().partition(":")
+        try:
+            models.append(_build_provider(provider, model_name))
+        except Exception as e:
+            print(f"Skipping LLM provider {entry.strip()} for {tier} tier: {e}")
+            continue
+        names.append(entry.strip())
+
+    if not models:
+        raise RuntimeError(f"No LLM provider available for the {tier} tier")
+
+    return HedgedChatModel(models=models, provider_names=names)
+
+
+def get_tiered_chat_model() -> TieredChatModel:
+    """
+    :return: chat model that routes with the fast tier and synthesizes with the strong tier
+    """
+    return TieredChatModel(fast=get_chat_model(FAST_TIER), strong=get_chat_model(STRONG_TIER))
+
+
+if __name__ == "__main__":
+    llm = get_tiered_chat_model()
+    for _ in range(3):
+        print(llm.invoke("Responda apenas 'ok'.").content)
+    print(latency_tracker.stats())
@@ -0,0 +1,14 @@
+import os
+from simbora.services.session_service import SessionService
+
+SESSION_EVICTION_INTERVAL_SECONDS = float(os.getenv("SESSION_EVICTION_INTERVAL_SECONDS", 60))
+
+session_service = SessionService(
+    db_path=os.getenv("SESSION_DB_PATH", "./sessions.sqlite"),
+    idle_ttl=float(os.getenv("SESSION_IDLE_TTL_SECONDS", 30 * 60)),
+    max_sessions=int(os.getenv("SESSION_MAX_SESSIONS", 5000)),
+    vacuum_interval=float(os.getenv("SESSION_VACUUM_INTERVAL_SECONDS", 60 * 60)),
+)
+
+if __name__ == "__main__":
+    print(f"Evicted {session_service.evict()} sessions.")
@@ -0,0 +1,150 @@
+import time
+import sqlite3
+import threading
+from typing import Optional
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+
+class SessionService:
+    def __init__(
+        self,
+        db_path: str,
+        idle_ttl: float,
+        max_sessions: int,
+        vacuum_interval: float,
+    ):
+        self._idle_ttl = idle_ttl
+        self._max_sessions = max_sessions
+        self._vacuum_interval = vacuum_interval
+        self._last_vacuum = time.time()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # checkpoints live on disk, so memory does not grow with the number of sessions.
+        # the file still grows with the checkpoints of each turn until prune, evict and vacuum run
+        self.checkpointer = SqliteSaver(sqlite3.connect(db_path, check_same_thread=False))
+        self.checkpointer.setup()
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS session_activity (thread_id TEXT PRIMARY KEY, last_seen REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS session_activity_last_seen ON session_activity (last_seen)"
+            )
+
+    def touch(self, thread_id: str):
+        """
+        marks the session as active now
+        :param thread_id: session thread id
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO session_activity (thread_id, last_seen) VALUES (?, ?) "
+                "ON CONFLICT(thread_id) DO UPDATE SET last_seen = excluded.last_seen",
+                (thread_id, time.time())
+            )
+
+
+    def prune(self, thread_id: str):
+        """
+        keeps only the latest root checkpoint of the session, which is all that is needed to
+        resume it once the turn is over. The supervisor and agents subgraphs checkpoint under a
+        new namespace every turn, so all their checkpoints are dropped.
+        Must be called after the turn, never while it is running.
+        :param thread_id: session thread id
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM checkpoints WHERE thread_id = ? AND (checkpoint_ns != '' OR checkpoint_id < ("
+                "SELECT MAX(latest.checkpoint_id) FROM checkpoints AS latest "
+                "WHERE latest.thread_id = checkpoints.thread_id AND latest.checkpoint_ns = ''))",
+                (thread_id,)
+            )
+            self._conn.execute(
+                "DELETE FROM writes WHERE thread_id = ? AND NOT EXISTS ("
+                "SELECT 1 FROM checkpoints WHERE checkpoints.thread_id = writes.thread_id "
+                "AND checkpoints.checkpoint_ns = writes.checkpoint_ns AND checkpoints.checkpoint_id = writes.checkpoint_id)",
+                (thread_id,)
+            )
+
+
+    def _expired_sessions(self) -> list[tuple[str, float]]:
+        """
+        :return: thread ids and last activity of the sessions idle for longer than the ttl,
+        plus the least recently used ones over the sessions cap
+        """
+        with self._lock:
+            idle = self._conn.execute(
+                "SELECT thread_id, last_seen FROM session_activity WHERE last_seen < ?",
+                (time.time() - self._idle_ttl,)
+            ).fetchall()
+            over_cap = self._conn.execute(
+                "SELECT thread_id, last_seen FROM session_activity ORDER BY last_seen DESC LIMIT -1 OFFSET ?",
+                (self._max_sessions,)
+            ).fetchall()
+
+        return list(set(idle + over_cap))
+
+
+    def evict(self) -> int:
+        """
+        deletes the checkpoints of idle sessions and of the sessions over the cap
+        :return: number of evicted sessions
+        """
+        evicted = 0
+        for thread_id, last_seen in self._expired_sessions():
+            # holding the lock, a session touched since it was listed is skipped and
+            # a touch arriving now waits until its checkpoints are gone
+            with self._lock:
+                with self._conn:
+                    deleted = self._conn.execute(
+                        "DELETE FROM session_activity WHERE thread_id = ? AND last_seen = ?",
+                        (thread_id, last_seen)
+                    ).rowcount
+                if deleted:
+                    self.checkpointer.delete_thread(thread_id)
+                    evicted += 1
+
+        return evicted
+
+
+    def vacuum(self):
+        """
+        gives the space of deleted checkpoints back to the file system
+        """
+        with self._lock:
+            self._conn.execute("VACUUM")
+        self._last_vacuum = time.time()
+
+
+    def _run(self, interval: float):
+        while not self._stop_event.is_set():
+            try:
+                self.evict()
+                if time.time() - self._last_vacuum >= self._vacuum_interval:
+                    self.vacuum()
+            except Exception as e:
+                print(f"Session eviction failed: {e}")
+            self._stop_event.wait(interval)
+
+
+    def start(self, interval: float):
+        """
+        starts the background eviction of idle sessions
+        :param interval: seconds between evictions
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="session-evictor", daemon=True)
+        self._thread.start()
+
+
+    def stop(self):
+        """
+        stops the background eviction of idle sessions
+        """
+        self._stop_event.set()
@@ -0,0 +1,12 @@
+import os
+from simbora.tools.sigaa import SigaaAPI
+
+CLIENT_ID = os.getenv("SIGAA_API_CLIENT_ID")
+CLIENT_SECRET = os.getenv("SIGAA_API_CLIENT_SECRET") 
+X_API_KEY = os.getenv("SIGAA_API_X_API_KEY")
+
+sigaa_api = SigaaAPI(
+    client_id=CLIENT_ID,
+    client_secret=CLIENT_SECRET,
+    x_api_key=X_API_KEY,
+)
@@ -0,0 +1,27 @@
+import os
+from typing import List, Optional
+from langchain.schema import Document
+from simbora.services.forum_index import get_forum_index
+
+FORUM_SEARCH_MAX_RESULTS = int(os.getenv("FORUM_SEARCH_MAX_RESULTS", 8))
+
+def buscar_mensagens_foruns(
+    consulta: str,
+    id_curso: Optional[int] = None,
+    data_inicio: Optional[str] = None,
+    data_fim: Optional[str] = None,
+    quantidade: int = 5
+) -> List[Document]:
+    """
+    Busca semanticamente as mensagens dos fóruns de cursos do SIGAA mais relevantes para a consulta.
+    Utilize esta ferramenta para encontrar discussões sobre ofertas de disciplinas e períodos de matrícula, em vez de ler fóruns inteiros.
+    Apenas os fóruns dos cursos indexados, informados nas suas instruções, podem ser encontrados.
+
+    :param str consulta: Texto que descreve o assunto procurado nas mensagens.
+    :param int id_curso: ID do curso para filtrar as mensagens (opcional).
+    :param str data_inicio: Data no formato AAAA-MM-DD, retorna apenas mensagens a partir desta data (opcional).
+    :param str data_fim: Data no formato AAAA-MM-DD, retorna apenas mensagens até esta data (opcional).
+    :param int quantidade: Quantidade de mensagens a retornar, limitada pelo máximo configurado.
+    """
+    quantidade = max(1, min(quantidade, FORUM_SEARCH_MAX_RESULTS))
+    return get_forum_index().search(consulta, id_curso=id_curso, data_inicio=data_inicio, data_fim=data_fim, k=quantidade)
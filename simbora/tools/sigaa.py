@@ -30,6 +30,17 @@ class SigaaAPI:
             return response.json()['access_token']
         else:
             raise Exception('Authentication failed: {}'.format(response.text))
+
+    def _get(self, url: str, headers: dict, params: Optional[dict] = None):
+        """
+        requisição GET que renova o token de acesso e tenta novamente uma vez quando ele expira
+        """
+        response = requests.get(url, headers=headers, params=params)
+        if response.status_code == 401:
+            self._access_token = self._get_access_token()
+            headers['Authorization'] = f'Bearer {self._access_token}'
+            response = requests.get(url, headers=headers, params=params)
+        return response
     
     def get_unidades(self, nome_ou_sigla_do_departamento_da_ufrn: str):
         """
@@ -50,7 +61,7 @@ class SigaaAPI:
         }
 
         unidades = []
-        response = requests.get(url, headers=headers, params=params)
+        response = self._get(url, headers, params=params)
         if response.status_code == 200:
             data = response.json()
             unidades = data
@@ -78,7 +89,7 @@ class SigaaAPI:
         }
 
         avaliacoes = []
-        response = requests.get(url, headers=headers, params=params)
+        response = self._get(url, headers, params=params)
         if response.status_code == 200:
             data = response.json()
             avaliacoes = data
@@ -98,7 +109,7 @@ class SigaaAPI:
         }
 
         noticias = []
-        response = requests.get(url, headers=headers)
+        response = self._get(url, headers)
         if response.status_code == 200:
             data = response.json()
             noticias = data
@@ -134,7 +145,7 @@ class SigaaAPI:
         }
 
         componentes = []
-        response = requests.get(url, headers=headers, params=params)
+        response = self._get(url, headers, params=params)
         if response.status_code == 200:
             data = response.json()
             componentes = data
@@ -163,7 +174,7 @@ class SigaaAPI:
         }
 
         matrizes = []
-        response = requests.get(url, headers=headers, params=params)
+        response = self._get(url, headers, params=params)
         if response.status_code == 200:
             data = response.json()
             matrizes = data
@@ -194,7 +205,7 @@ class SigaaAPI:
         }
 
         calendarios = []
-        response = requests.get(url, headers=headers, params=params)
+        response = self._get(url, headers, params=params)
         if response.status_code == 200:
             data = response.json()
             calendarios = data
@@ -223,7 +234,7 @@ class SigaaAPI:
         }
 
         cursos = []
-        response = requests.get(url, headers=headers, params=params)
+        response = self._get(url, headers, params=params)
         if response.status_code == 200:
             data = response.json()
             cursos = data
@@ -251,7 +262,7 @@ class SigaaAPI:
         }
 
         foruns = []
-        response = requests.get(url, headers=headers, params=params)
+        response = self._get(url, headers, params=params)
         if response.status_code == 200:
             data = response.json()
             foruns = data
@@ -279,7 +290,39 @@ class SigaaAPI:
         }
 
         mensagens = []
-        response = requests.get(url, headers=headers, params=params)
+        response = self._get(url, headers, params=params)
+        if response.status_code == 200:
+            data = response.json()
+            mensagens = data
+        else:
+            raise Exception('Failed to fetch mensagens de fóruns: {}'.format(response.text))
+        return mensagens
+
+    def get_mensagens_forum_pagina(self, id_forum: int, offset: int = 0, limit: int = 100):
+        """
+        busca uma página de mensagens de um fórum, das mais recentes para as mais antigas.
+        Não é exposto como ferramenta, é utilizado pelo indexador de fóruns.
+
+        :param int id_forum: ID do fórum para o qual se deseja buscar as mensagens.
+        :param int offset: Quantidade de mensagens a pular.
+        :param int limit: Quantidade máxima de mensagens da página.
+        """
+        url = SigaaAPI.MENSAGENS_FORUNS_CURSOS_URL
+        
+        headers = {
+            'Authorization': f'Bearer {self._access_token}',
+            'x-api-key': self._x_api_key,
+        }
+
+        params = {
+            'id-topico': id_forum,
+            'offset': offset,
+            'limit': limit,
+            'order-desc': 'id-mensagem-forum'
+        }
+
+        mensagens = []
+        response = self._get(url, headers, params=params)
         if response.status_code == 200:
             data = response.json()
             mensagens = data